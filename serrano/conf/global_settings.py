@@ -61,6 +61,31 @@ OBJECT_SETS = ()
 # metadata, but incurs an overhead.
 CHECK_ORPHANED_FIELDS = True
 
+# Integer of seconds an object's accessed time is considered current.
+# When set, reads of single context/view/query objects only refresh the
+# accessed time on the row once the existing value is older than this
+# interval, which keeps high-traffic read endpoints from issuing a write
+# on every request. The default of 0 updates the accessed time on every
+# read; note that throttling also delays the accessed-based ordering of
+# list endpoints.
+ACCESSED_UPDATE_INTERVAL = 0
+
+# Integer of seconds a computed field distribution is cached. When set,
+# distribution responses carry an ETag derived from the field, context
+# and parameters; conditional requests with a matching If-None-Match
+# header are answered with 304 Not Modified and cache hits skip the
+# aggregation and clustering entirely. Set to None to disable, which
+# avoids the hashing overhead for deployments without repeat callers.
+DISTRIBUTION_CACHE_TIMEOUT = None
+
+# Integer number of worker threads used to run the distribution
+# clustering and outlier detection routines. When set, a shared pool of
+# this size serves all requests, bounding the number of concurrent
+# k-means runs per process so a few expensive distributions cannot
+# monopolize every request thread. Set to None to run the routines
+# inline on the request thread.
+STATS_WORKERS = None
+
 # Export cookie settings. The template is required to take one positional
 # parameter, the export type, to distinguish itself from other exporter
 # cookies. The data is simply a value that is set by the server to denote
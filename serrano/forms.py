@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 
 import logging
+import re
 from django import forms
 from django.conf import settings as django_settings
 from django.contrib.auth.models import User
@@ -16,11 +17,34 @@ from serrano.conf import settings
 
 log = logging.getLogger(__name__)
 
+# Share labels are comma-delimited and never legitimately contain
+# whitespace, so commas and runs of whitespace are equivalent delimiters.
+SHARE_LABEL_DELIMITER = re.compile(r'[\s,]+')
+
 SHARED_QUERY_EMAIL_TITLE = '{site_name}: {query_name} has been shared with '\
                            'you!'
 SHARED_QUERY_EMAIL_BODY = 'View the query at {query_url}'
 
 
+def _count_needs_update(existing, json, count):
+    """Returns true if the stored count can no longer be trusted.
+
+    Existing conditions, changed conditions, or supplied conditions
+    without a count all invalidate the stored value. The early returns
+    keep the cheap checks first and stop as soon as an answer is known.
+    """
+    if existing:
+        return True
+
+    if not json:
+        return False
+
+    if existing != json:
+        return True
+
+    return count is None
+
+
 class ContextForm(forms.ModelForm):
     def __init__(self, request, *args, **kwargs):
         self.request = request
@@ -34,23 +58,16 @@ class ContextForm(forms.ModelForm):
         json = self.cleaned_data.get('json')
 
         if self.count_needs_update is None and self.instance:
-            existing = self.instance.json
-
-            if (existing or json and existing != json or json and
-                    self.instance.count is None):
-                self.count_needs_update = True
-            else:
-                self.count_needs_update = False
+            self.count_needs_update = _count_needs_update(
+                self.instance.json, json, self.instance.count)
         return json
 
     def save(self, commit=True):
         instance = super(ContextForm, self).save(commit=False)
         request = self.request
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            instance.user = request.user
-        else:
-            instance.session_key = request.session.session_key
+        for key, value in utils.get_owner_kwargs(request).items():
+            setattr(instance, key, value)
 
         QueryProcessor = pipeline.query_processors[self.processor]
         processor = QueryProcessor(tree=self.tree)
@@ -60,12 +77,14 @@ class ContextForm(forms.ModelForm):
         # prevent re-counting the entire dataset. An alternative
         # solution may be desirable such as pre-computing and
         # caching the count ahead of time.
+        # Note, when no update is needed the existing count is left intact
+        # rather than being cleared. A non-null count is served directly by
+        # the stats resource, so wiping it here would throw away a still
+        # valid cached value.
         if self.count_needs_update:
             instance.count = \
-                instance.apply(queryset=queryset).distinct().count()
+                utils.distinct_count(instance.apply(queryset=queryset))
             self.count_needs_update = False
-        else:
-            instance.count = None
 
         if commit:
             instance.save()
@@ -86,10 +105,8 @@ class ViewForm(forms.ModelForm):
         instance = super(ViewForm, self).save(commit=False)
         request = self.request
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            instance.user = request.user
-        else:
-            instance.session_key = request.session.session_key
+        for key, value in utils.get_owner_kwargs(request).items():
+            setattr(instance, key, value)
 
         if commit:
             instance.save()
@@ -118,23 +135,16 @@ class QueryForm(forms.ModelForm):
     def clean_context_json(self):
         json = self.cleaned_data.get('context_json')
         if self.count_needs_update_context is None:
-            existing = self.instance.context_json
-            if (existing or json and existing != json or json and
-                    self.instance.count is None):
-                self.count_needs_update_context = True
-            else:
-                self.count_needs_update_context = False
+            self.count_needs_update_context = _count_needs_update(
+                self.instance.context_json, json,
+                self.instance.distinct_count)
         return json
 
     def clean_view_json(self):
         json = self.cleaned_data.get('view_json')
         if self.count_needs_update_view is None:
-            existing = self.instance.view_json
-            if (existing or json and existing != json or json and
-                    self.instance.count is None):
-                self.count_needs_update_view = True
-            else:
-                self.count_needs_update_view = False
+            self.count_needs_update_view = _count_needs_update(
+                self.instance.view_json, json, self.instance.record_count)
         return json
 
     def clean_usernames_or_emails(self):
@@ -146,31 +156,37 @@ class QueryForm(forms.ModelForm):
         """
         user_labels = self.cleaned_data.get('usernames_or_emails')
         emails = set()
-        for label in user_labels.split(','):
-            # Remove whitespace from the label, there should not be whitespace
-            # in usernames or email addresses. This use of split is somewhat
-            # non-obvious, see the link below:
-            #       http://docs.python.org/2/library/stdtypes.html#str.split
-            label = "".join(label.split())
+        usernames = set()
 
-            if not label:
-                continue
+        # Tokenize the whole field with a single precompiled regex split
+        # rather than splitting and re-joining each label. Deduplicate so
+        # the validator below only runs once per unique address.
+        labels = set(
+            label for label in SHARE_LABEL_DELIMITER.split(user_labels)
+            if label)
 
+        for label in labels:
             try:
                 validate_email(label)
                 emails.add(label)
             except ValidationError:
-                # If this user lookup label is not an email address, try to
-                # find the user with the supplied username and get the
-                # email that way. If no user with this username is found
-                # then give up since we only support email and username
-                # lookups.
-                try:
-                    user = User.objects.only('email').get(username=label)
-                    emails.add(user.email)
-                except User.DoesNotExist:
-                    log.warning("Unable to share query with '{0}'. It is not "
-                                "a valid email or username.".format(label))
+                # If this user lookup label is not an email address, fall
+                # back to a username lookup below. Since we only support
+                # email and username lookups, labels that do not resolve to
+                # a user are given up on.
+                usernames.add(label)
+
+        if usernames:
+            # Resolve all the usernames with a single query rather than one
+            # query per label.
+            users = dict(User.objects.filter(username__in=usernames)
+                         .values_list('username', 'email'))
+
+            emails.update(users.values())
+
+            for label in usernames - set(users):
+                log.warning("Unable to share query with '{0}'. It is not "
+                            "a valid email or username.".format(label))
 
         return emails
 
@@ -178,17 +194,15 @@ class QueryForm(forms.ModelForm):
         instance = super(QueryForm, self).save(commit=False)
         request = self.request
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            instance.user = request.user
-        else:
-            instance.session_key = request.session.session_key
+        for key, value in utils.get_owner_kwargs(request).items():
+            setattr(instance, key, value)
 
         # Only recalculated count if conditions exist. This is to
         # prevent re-counting the entire dataset. An alternative
         # solution may be desirable such as pre-computing and
         # caching the count ahead of time.
         if self.count_needs_update_context:
-            instance.distinct_count = instance.apply().distinct().count()
+            instance.distinct_count = utils.distinct_count(instance.apply())
             self.count_needs_update_context = False
         else:
             instance.distinct_count = None
@@ -221,12 +235,21 @@ class QueryForm(forms.ModelForm):
                 'email', flat=True))
             new_emails = all_emails - existing_emails
 
-            site = get_current_site(request)
+            # get_current_site() may query the database, so memoize the
+            # result on the request for reuse within the same request cycle.
+            if not hasattr(request, '_current_site'):
+                request._current_site = get_current_site(request)
+            site = request._current_site
 
+            # Resolve the absolute host prefix once. Reversed paths below
+            # are prepended with it via string concatenation rather than
+            # additional build_absolute_uri calls.
             try:
-                site_url = request.build_absolute_uri(script_name + '/')
+                host_url = request.build_absolute_uri('/')[:-1]
             except KeyError:
-                site_url = site.domain + script_name
+                host_url = site.domain
+
+            site_url = host_url + script_name + '/'
 
             # Use the site url as the default query url in case there are
             # issues generating the query url.
@@ -236,16 +259,11 @@ class QueryForm(forms.ModelForm):
 
             if reverse_name:
                 try:
-                    query_url = reverse(reverse_name,
-                                        kwargs={'pk': instance.pk})
-
                     # Since reverse will just return the path to the query
-                    # we need to prepend the site url to make it a valid
+                    # we need to prepend the host url to make it a valid
                     # link that people can follow.
-                    try:
-                        query_url = request.build_absolute_uri(query_url)
-                    except KeyError:
-                        query_url = site.domain + script_name + query_url
+                    query_url = host_url + reverse(
+                        reverse_name, kwargs={'pk': instance.pk})
                 except NoReverseMatch:
                     log.warn("Could not reverse '{0}'. ".format(reverse_name))
             else:
@@ -256,24 +274,44 @@ class QueryForm(forms.ModelForm):
 
             body = SHARED_QUERY_EMAIL_BODY.format(query_url=query_url)
 
-            if self.cleaned_data.get('message'):
-                body = '{0}\n\n--\n{1}'.format(
-                    self.cleaned_data.get('message'), body)
+            message = self.cleaned_data.get('message')
 
-            # Email and register all the new email addresses
-            utils.send_mail(new_emails, title, body)
+            if message:
+                body = '{0}\n\n--\n{1}'.format(message, body)
+
+            # Share with all the new addresses. Users that already have an
+            # account are added to shared_users in one bulk insert rather
+            # than one query per address. Only the pk and email are pulled
+            # from the database since nothing else is needed here.
+            # Addresses without an account still go through share_with_user
+            # which handles creating the user.
+            users = dict(User.objects.filter(email__in=new_emails)
+                         .values_list('email', 'pk'))
 
-            for email in new_emails:
+            if users:
+                instance.shared_users.add(*users.values())
+
+            for email in new_emails - set(users):
                 instance.share_with_user(email)
 
-            # Find and remove users who have had their query share revoked
+            # Find and remove users who have had their query share revoked.
+            # Passing all the pks in a single remove() call issues one
+            # DELETE instead of one per user.
             removed_emails = existing_emails - all_emails
 
-            for user in User.objects.filter(email__in=removed_emails):
-                instance.shared_users.remove(user)
+            if removed_emails:
+                removed_ids = User.objects.filter(
+                    email__in=removed_emails).values_list('pk', flat=True)
+                instance.shared_users.remove(*removed_ids)
 
             self.save_m2m()
 
+            # Notify all the new email addresses. send_mail dispatches on a
+            # background thread by default, so the response is not blocked
+            # on SMTP. This happens last so no one is notified about shares
+            # that failed to persist above.
+            utils.send_mail(new_emails, title, body)
+
         return instance
 
     class Meta(object):
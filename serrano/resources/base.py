@@ -1,5 +1,5 @@
 import functools
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.core.cache import cache
 from restlib2.params import Parametizer
 from restlib2.resources import Resource
@@ -209,8 +209,24 @@ class BaseResource(Resource):
         return response
 
     def get_params(self, request):
-        "Returns cleaned set of GET parameters."
-        return self.parametizer().clean(request.GET, self.param_defaults)
+        """Returns cleaned set of GET parameters.
+
+        Parametizer cleaning is pure Python and its result only depends
+        on the querystring, so the cleaned params are memoized on the
+        request (keyed by resource class) for handlers that consult them
+        more than once.
+        """
+        if not hasattr(request, '_serrano_params'):
+            request._serrano_params = {}
+
+        params = request._serrano_params.get(self.__class__)
+
+        if params is None:
+            params = self.parametizer().clean(request.GET,
+                                              self.param_defaults)
+            request._serrano_params[self.__class__] = params
+
+        return params
 
     def get_context(self, request, attrs=None):
         "Returns a DataContext object based on `attrs` or the request."
@@ -228,6 +244,26 @@ class BaseResource(Resource):
     def checks_for_orphans(self):
         return settings.CHECK_ORPHANED_FIELDS
 
+    def update_accessed(self, instance):
+        """Updates the accessed time of `instance` with a single field
+        update.
+
+        Writes are throttled by the ACCESSED_UPDATE_INTERVAL setting so
+        read endpoints do not issue a write for every request; the
+        accessed time is only refreshed once the stored value is older
+        than the interval.
+        """
+        now = datetime.now()
+        interval = settings.ACCESSED_UPDATE_INTERVAL
+
+        if interval and instance.accessed and \
+                now - instance.accessed < timedelta(seconds=interval):
+            return
+
+        # Fast single field update..
+        # TODO Django 1.5+ supports this on instance save methods.
+        self.model.objects.filter(pk=instance.pk).update(accessed=now)
+
 
 class ThrottledResource(BaseResource):
     def __init__(self, **kwargs):
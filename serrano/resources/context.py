@@ -1,6 +1,4 @@
-import functools
 import logging
-from datetime import datetime
 from django.conf.urls import patterns, url
 from django.core.urlresolvers import reverse
 from django.views.decorators.cache import never_cache
@@ -11,6 +9,7 @@ from modeltree.tree import MODELTREE_DEFAULT_ALIAS, trees
 from avocado.events import usage
 from avocado.models import DataContext
 from avocado.query import pipeline
+from serrano import utils
 from serrano.forms import ContextForm
 from .base import ThrottledResource
 from .history import RevisionsResource, ObjectRevisionsResource, \
@@ -20,23 +19,42 @@ from . import templates
 log = logging.getLogger(__name__)
 
 
-def context_posthook(instance, data, request, tree):
-    uri = request.build_absolute_uri
+class ContextHook(object):
+    """Serialization post-hook for augmenting per-instance data.
 
-    opts = tree.root_model._meta
-    data['object_name'] = opts.verbose_name.format()
-    data['object_name_plural'] = opts.verbose_name_plural.format()
+    A single hook instance is shared across a serialize call rather than
+    allocating a new functools.partial, since list responses invoke the
+    hook once per serialized object.
+    """
 
-    data['_links'] = {
-        'self': {
-            'href': uri(
-                reverse('serrano:contexts:single', args=[instance.pk])),
-        },
-        'stats': {
-            'href': uri(reverse('serrano:contexts:stats', args=[instance.pk])),
+    __slots__ = ('request', 'object_name', 'object_name_plural')
+
+    def __init__(self, request, tree):
+        self.request = request
+
+        # The object names depend only on the tree, so resolve them once
+        # here rather than re-formatting them for every serialized object.
+        opts = tree.root_model._meta
+        self.object_name = opts.verbose_name.format()
+        self.object_name_plural = opts.verbose_name_plural.format()
+
+    def __call__(self, instance, data):
+        uri = self.request.build_absolute_uri
+
+        data['object_name'] = self.object_name
+        data['object_name_plural'] = self.object_name_plural
+
+        data['_links'] = {
+            'self': {
+                'href': uri(
+                    reverse('serrano:contexts:single', args=[instance.pk])),
+            },
+            'stats': {
+                'href': uri(
+                    reverse('serrano:contexts:stats', args=[instance.pk])),
+            }
         }
-    }
-    return data
+        return data
 
 
 class ContextParametizer(Parametizer):
@@ -58,23 +76,20 @@ class ContextBase(ThrottledResource):
             template = self.template
 
         tree = trees[tree]
-        posthook = functools.partial(
-            context_posthook, request=request, tree=tree)
+        posthook = ContextHook(request, tree)
         return serialize(instance, posthook=posthook, **template)
 
     def get_queryset(self, request, **kwargs):
         "Constructs a QuerySet for this user or session."
+        owner = utils.get_owner_kwargs(request)
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            kwargs['user'] = request.user
-        elif request.session.session_key:
-            kwargs['session_key'] = request.session.session_key
-        else:
-            # The only case where kwargs is empty is for non-authenticated
-            # cookieless agents.. e.g. bots, most non-browser clients since
-            # no session exists yet for the agent.
+        # The only case where the owner kwargs are empty is for
+        # non-authenticated cookieless agents.. e.g. bots, most non-browser
+        # clients since no session exists yet for the agent.
+        if not owner:
             return self.model.objects.none()
 
+        kwargs.update(owner)
         return self.model.objects.filter(**kwargs)
 
     def get_object(self, request, pk=None, session=None, **kwargs):
@@ -118,14 +133,12 @@ class ContextsResource(ContextBase):
         params = self.get_params(request)
         queryset = self.get_queryset(request)
 
-        # Only create a default if a session exists
-        if request.session.session_key:
-            queryset = list(queryset)
-
-            if not len(queryset):
-                default = self.get_default(request)
-                if default:
-                    queryset.append(default)
+        # Only create a default if a session exists. The exists() check
+        # compiles to a LIMIT 1 query rather than materializing the full
+        # queryset just to test for emptiness.
+        if request.session.session_key and not queryset.exists():
+            default = self.get_default(request)
+            queryset = [default] if default else []
 
         return self.prepare(request, queryset, tree=params['tree'])
 
@@ -164,10 +177,7 @@ class ContextResource(ContextBase):
         instance = self.get_object(request, **kwargs)
         usage.log('read', instance=instance, request=request)
 
-        # Fast single field update..
-        # TODO Django 1.5+ supports this on instance save methods.
-        self.model.objects.filter(pk=instance.pk).update(
-            accessed=datetime.now())
+        self.update_accessed(instance)
 
         return self.prepare(request, instance, tree=params['tree'])
 
@@ -218,8 +228,19 @@ class ContextStatsResource(ContextBase):
     def get(self, request, **kwargs):
         instance = self.get_object(request, **kwargs)
 
+        # Serve the count cached on the row when present. The form
+        # invalidates the count whenever the conditions change, so a
+        # non-null value is still current. Otherwise compute it once and
+        # store it using the same single field update pattern used for
+        # `accessed`.
+        count = instance.count
+
+        if count is None:
+            count = utils.distinct_count(instance.apply())
+            self.model.objects.filter(pk=instance.pk).update(count=count)
+
         return {
-            'count': instance.apply().distinct().count()
+            'count': count,
         }
 
 
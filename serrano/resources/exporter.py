@@ -12,7 +12,26 @@ from . import API_VERSION
 from .base import BaseResource
 
 # Single list of all registered exporters
-EXPORT_TYPES = zip(*exporters.choices)[0]
+EXPORT_TYPES = tuple(choice[0] for choice in exporters.choices)
+
+# Exporter titles and descriptions are fixed at registration time, so
+# resolve them from the registry once at import rather than on every
+# request to the root resource.
+EXPORTER_METADATA = dict(
+    (export_type, {
+        'title': exporters.get(export_type).short_name,
+        'description': exporters.get(export_type).long_name,
+    }) for export_type in EXPORT_TYPES)
+
+# Membership tests and exporter class lookups happen on every export
+# request, so keep O(1) structures resolved once at import.
+EXPORT_TYPE_SET = frozenset(EXPORT_TYPES)
+EXPORTER_CLASSES = dict(
+    (export_type, exporters[export_type]) for export_type in EXPORT_TYPES)
+
+# Cookie names are a pure function of the export type, so cache them as
+# they are first formatted rather than re-formatting on every request.
+EXPORT_COOKIE_NAMES = {}
 
 
 class ExporterRootResource(BaseResource):
@@ -30,12 +49,10 @@ class ExporterRootResource(BaseResource):
         }
 
         for export_type in EXPORT_TYPES:
-            resp['_links'][export_type] = {
-                'href': uri(reverse('serrano:data:exporter',
-                                    kwargs={'export_type': export_type})),
-                'title': exporters.get(export_type).short_name,
-                'description': exporters.get(export_type).long_name,
-            }
+            link = dict(EXPORTER_METADATA[export_type])
+            link['href'] = uri(reverse('serrano:data:exporter',
+                                       kwargs={'export_type': export_type}))
+            resp['_links'][export_type] = link
         return resp
 
 
@@ -54,8 +71,6 @@ class ExporterResource(BaseResource):
 
     def _export(self, request, export_type, view, context, **kwargs):
         # Handle an explicit export type to a file
-        resp = HttpResponse()
-
         params = self.get_params(request)
 
         limit = params.get('limit')
@@ -101,17 +116,35 @@ class ExporterResource(BaseResource):
         processor = QueryProcessor(context=context, view=view, tree=tree,
                                    include_pk=False)
 
-        exporter = processor.get_exporter(exporters[export_type])
+        exporter = processor.get_exporter(EXPORTER_CLASSES[export_type])
         iterable = processor.get_iterable()
 
-        # Write the data to the response
+        # When the iterable is a queryset, use the server-side cursor
+        # iterator so rows stream from the database without being cached
+        # on the queryset, keeping memory bounded for large exports.
+        if hasattr(iterable, 'iterator'):
+            iterable = iterable.iterator()
+
+        # The export is written into a buffered response. Streaming it
+        # is not an option while the pinned restlib2 dispatch only
+        # passes HttpResponse instances through untouched -- a
+        # StreamingHttpResponse would be re-serialized as content and
+        # lose the headers and cookie set below.
+        resp = HttpResponse()
         exporter.write(iterable, resp, request=request, offset=offset,
                        limit=limit)
 
+        timestamp = datetime.now().strftime('%Y%m%dT%H%M%S')
         filename = '{0}-{1}-data.{2}'.format(
-            file_tag, datetime.now(), exporter.file_extension)
+            file_tag, timestamp, exporter.file_extension)
+
+        cookie_name = EXPORT_COOKIE_NAMES.get(export_type)
+
+        if cookie_name is None:
+            cookie_name = \
+                settings.EXPORT_COOKIE_NAME_TEMPLATE.format(export_type)
+            EXPORT_COOKIE_NAMES[export_type] = cookie_name
 
-        cookie_name = settings.EXPORT_COOKIE_NAME_TEMPLATE.format(export_type)
         resp.set_cookie(cookie_name, settings.EXPORT_COOKIE_DATA)
 
         resp['Content-Disposition'] = 'attachment; filename="{0}"'.format(
@@ -127,7 +160,7 @@ class ExporterResource(BaseResource):
 
     # Resource is dependent on the available export types
     def is_not_found(self, request, response, export_type, **kwargs):
-        return export_type not in EXPORT_TYPES
+        return export_type not in EXPORT_TYPE_SET
 
     def get(self, request, export_type, **kwargs):
         view = self.get_view(request)
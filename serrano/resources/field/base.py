@@ -14,29 +14,57 @@ from .. import templates
 can_change_field = lambda u: u.has_perm('avocado.change_datafield')
 log = logging.getLogger(__name__)
 
+# Reversed path templates for the field links. The paths only vary by the
+# field pk, so each route is reversed once with a placeholder pk and
+# formatted per instance thereafter. Populated lazily since the URLconf
+# is not loaded at import time.
+_uri_templates = {}
+
+
+def get_uri_templates():
+    if not _uri_templates:
+        for key, name in (('self', 'serrano:field'),
+                          ('values', 'serrano:field-values'),
+                          ('distribution', 'serrano:field-distribution'),
+                          ('stats', 'serrano:field-stats')):
+            _uri_templates[key] = \
+                reverse(name, args=[0]).replace('/0/', '/{0}/', 1)
+    return _uri_templates
+
 
 def is_field_orphaned(instance):
-    if instance.model is None or instance.field is None:
-        log.error("Field is an orphan.", extra={'field': instance.pk})
-        return True
-    return False
+    # The result is memoized on the instance since list responses run the
+    # check once while filtering and again in the serialization posthook.
+    # Each check resolves the model and field anew, so caching it avoids
+    # the repeated lookups (and duplicate error logs) per instance.
+    orphaned = getattr(instance, '_orphaned', None)
+
+    if orphaned is None:
+        orphaned = instance.model is None or instance.field is None
+        instance._orphaned = orphaned
 
+        if orphaned:
+            log.error("Field is an orphan.", extra={'field': instance.pk})
 
-def field_posthook(instance, data, request):
+    return orphaned
+
+
+def field_posthook(instance, data, host):
     """Field serialization post-hook for augmenting per-instance data.
 
     The only two arguments the post-hook takes is instance and data. The
     remaining arguments must be partially applied using `functools.partial`
-    during the request/response cycle.
+    during the request/response cycle. `host` is the absolute host prefix
+    which, combined with the reversed path templates, avoids per-instance
+    reverse() and build_absolute_uri() calls.
     """
-
-    uri = request.build_absolute_uri
+    uris = get_uri_templates()
+    pk = instance.pk
 
     # Augment the links
     data['_links'] = {
         'self': {
-            'href': uri(reverse('serrano:field',
-                        args=[instance.pk])),
+            'href': host + uris['self'].format(pk),
         }
     }
 
@@ -46,19 +74,16 @@ def field_posthook(instance, data, request):
         data['orphaned'] = True
     else:
         data['_links']['values'] = {
-            'href': uri(reverse('serrano:field-values',
-                        args=[instance.pk])),
+            'href': host + uris['values'].format(pk),
         }
         data['_links']['distribution'] = {
-            'href': uri(reverse('serrano:field-distribution',
-                        args=[instance.pk])),
+            'href': host + uris['distribution'].format(pk),
         }
 
         stats_capable = settings.STATS_CAPABLE
         if stats_capable and stats_capable(instance):
             data['_links']['stats'] = {
-                'href': uri(reverse('serrano:field-stats',
-                            args=[instance.pk])),
+                'href': host + uris['stats'].format(pk),
             }
 
     return data
@@ -109,7 +134,17 @@ class FieldBase(ThrottledResource):
         if template is None:
             template = templates.BriefField if brief else self.template
 
-        posthook = functools.partial(field_posthook, request=request)
+        # Serialization is intentionally instance-based. Most keys in the
+        # field templates are computed attributes or aliased methods
+        # (__unicode__, get_plural_name, simple_type, operators, ...)
+        # resolved from the in-process model registry, so a values()-based
+        # fast path could not reproduce the payload and would not save
+        # any queries.
+
+        # Resolve the absolute host prefix once per serialize call; the
+        # per-instance links are derived from it by string formatting.
+        host = request.build_absolute_uri('/')[:-1]
+        posthook = functools.partial(field_posthook, host=host)
         return serialize(instance, posthook=posthook, **template)
 
     def is_not_found(self, request, response, pk, *args, **kwargs):
@@ -170,10 +205,16 @@ class FieldsResource(FieldResource):
             objects = queryset
 
         if self.checks_for_orphans:
-            pks = []
-            for obj in objects:
-                if not is_field_orphaned(obj):
-                    pks.append(obj.pk)
-            objects = self.model.objects.filter(pk__in=pks)
+            # Filter the orphans out in a single pass. The orphan check
+            # resolves against the app registry rather than the database,
+            # so the old pk__in re-query only re-fetched rows that were
+            # already in hand. Stream from the cursor when possible so
+            # the queryset does not build a result cache alongside the
+            # survivor list; the list is then the only materialized copy
+            # of the rows.
+            if hasattr(objects, 'iterator'):
+                objects = objects.iterator()
+
+            objects = [obj for obj in objects if not is_field_orphaned(obj)]
 
         return self.prepare(request, objects, **params)
@@ -1,5 +1,12 @@
 from decimal import Decimal
+from functools import reduce
+from hashlib import md5
+from itertools import islice
+from multiprocessing.pool import ThreadPool
+from operator import or_
+from django.core.cache import cache
 from django.db.models import Q
+from django.http import HttpResponseNotModified
 from restlib2.http import codes
 from restlib2.params import Parametizer, StrParam, BoolParam, IntParam
 from modeltree.tree import MODELTREE_DEFAULT_ALIAS, trees
@@ -7,12 +14,38 @@ from avocado.events import usage
 from avocado.models import DataField
 from avocado.query import pipeline
 from avocado.stats import kmeans
+from serrano.conf import settings
 from .base import FieldBase
 
 
 MINIMUM_OBSERVATIONS = 500
 MAXIMUM_OBSERVATIONS = 50000
 
+# Shared pool for the clustering routines, created lazily on first use
+# so worker threads are only spawned in deployments that set
+# SERRANO_STATS_WORKERS.
+_stats_pool = None
+
+
+def run_stats(func, *args, **kwargs):
+    """Runs a clustering routine, dispatching to the shared worker pool
+    when STATS_WORKERS is set.
+
+    The call still blocks until the result is available; the pool bounds
+    how many clustering runs execute at once across request threads.
+    """
+    global _stats_pool
+
+    workers = settings.STATS_WORKERS
+
+    if not workers:
+        return func(*args, **kwargs)
+
+    if _stats_pool is None:
+        _stats_pool = ThreadPool(processes=workers)
+
+    return _stats_pool.apply(func, args, kwargs)
+
 
 class FieldDistParametizer(Parametizer):
     aware = BoolParam(False)
@@ -48,6 +81,35 @@ class FieldDistribution(FieldBase):
         else:
             context = None
 
+        # When distribution caching is enabled, derive an ETag from the
+        # inputs that determine the response. A conditional request with a
+        # matching If-None-Match header is answered without running the
+        # aggregation, and cache hits for other callers with the same
+        # inputs skip straight to rendering.
+        timeout = settings.DISTRIBUTION_CACHE_TIMEOUT
+        etag = None
+        cache_key = None
+
+        if timeout:
+            etag = md5('|'.join([
+                str(instance.pk),
+                str(instance.modified),
+                str(sorted(params.items())),
+                str(dimensions),
+                str(context.json if context else None),
+            ])).hexdigest()
+
+            if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+                return HttpResponseNotModified()
+
+            cache_key = 'serrano:distribution:{0}'.format(etag)
+            data = cache.get(cache_key)
+
+            if data is not None:
+                response = self.render(request, data)
+                response['ETag'] = etag
+                return response
+
         QueryProcessor = pipeline.query_processors[params['processor']]
         processor = QueryProcessor(context=context, tree=tree)
 
@@ -57,11 +119,19 @@ class FieldDistribution(FieldBase):
         # user does not have permission to view. Default is to group by the
         # reference field for distinct counts.
         if any(dimensions):
+            # Resolve all dimensions with a single permission-aware query
+            # rather than a lookup per pk. The per-pk path went through
+            # get_object, which memoizes on the request and had already
+            # been primed with the field being distributed.
+            field_map = dict(
+                (str(f.pk), f)
+                for f in self.get_queryset(request).filter(pk__in=dimensions))
+
             fields = []
             groupby = []
 
-            for pk in dimensions:
-                f = self.get_object(request, pk=pk)
+            for dimension in dimensions:
+                f = field_map.get(dimension)
                 if f:
                     fields.append(f)
                     groupby.append(tree.query_string_for_field(f.field,
@@ -81,10 +151,20 @@ class FieldDistribution(FieldBase):
         # Exclude null values. Dependending on the downstream use of the data,
         # nulls may or may not be desirable.
         if not params['nulls']:
-            q = Q()
-            for field in groupby:
-                q = q | Q(**{field: None})
-            stats = stats.exclude(q)
+            # OR the null predicates together directly; starting from an
+            # empty Q() folds a needless node into the expression tree for
+            # every dimension.
+            stats = stats.exclude(
+                reduce(or_, (Q(**{field: None}) for field in groupby)))
+
+        # Apply ordering. If any of the fields are enumerable, ordering should
+        # be relative to those fields. For continuous data, the ordering is
+        # relative to the count of each group
+        if (any(d.enumerable for d in fields) and
+                not params['sort'] == 'count'):
+            stats = stats.order_by(*groupby)
+        else:
+            stats = stats.order_by('-count')
 
         # Begin constructing the response
         resp = {
@@ -94,8 +174,15 @@ class FieldDistribution(FieldBase):
             'size': 0,
         }
 
-        # Evaluate list of points
-        length = len(stats)
+        # Evaluate the list of points. This is the only evaluation of the
+        # queryset; the guards below work off the length of the list
+        # rather than evaluating the queryset a second time. Evaluation
+        # is capped one past the maximum so an over-large distribution is
+        # rejected after reading a threshold's worth of rows instead of
+        # materializing the entire result. The aggregator iterates its
+        # queryset in chunks, so abandoning the iterator stops fetching.
+        points = list(islice(iter(stats), MAXIMUM_OBSERVATIONS + 1))
+        length = len(points)
 
         # Nothing to do
         if not length:
@@ -113,29 +200,22 @@ class FieldDistribution(FieldBase):
             return self.render(request, data,
                                status=codes.unprocessable_entity)
 
-        # Apply ordering. If any of the fields are enumerable, ordering should
-        # be relative to those fields. For continuous data, the ordering is
-        # relative to the count of each group
-        if (any([d.enumerable for d in fields]) and
-                not params['sort'] == 'count'):
-            stats = stats.order_by(*groupby)
-        else:
-            stats = stats.order_by('-count')
-
         clustered = False
-        points = list(stats)
         outliers = []
 
         # For N-dimensional continuous data, check if clustering should occur
         # to down-sample the data.
-        if all([d.simple_type == 'number' for d in fields]):
-            # Extract observations for clustering
+        if all(d.simple_type == 'number' for d in fields):
+            # Extract observations for clustering, coercing decimals to
+            # floats up front. float() accepts a Decimal directly which is
+            # considerably faster than routing the value through str(),
+            # and the comprehension replaces per-cell index assignment.
             obs = []
             for point in points:
-                for i, dim in enumerate(point['values']):
-                    if isinstance(dim, Decimal):
-                        point['values'][i] = float(str(dim))
-                obs.append(point['values'])
+                values = [float(v) if isinstance(v, Decimal) else v
+                          for v in point['values']]
+                point['values'] = values
+                obs.append(values)
 
             # Perform k-means clustering. Determine centroids and calculate
             # the weighted count relatives to the centroid and observations
@@ -144,16 +224,19 @@ class FieldDistribution(FieldBase):
                 clustered = True
 
                 counts = [p['count'] for p in points]
-                points, outliers = kmeans.weighted_counts(
-                    obs, counts, params['n'])
+                points, outliers = run_stats(
+                    kmeans.weighted_counts, obs, counts, params['n'])
             else:
-                indexes = kmeans.find_outliers(obs, normalized=False)
+                indexes = run_stats(
+                    kmeans.find_outliers, obs, normalized=False)
 
-                outliers = []
-                for idx in indexes:
-                    outliers.append(points[idx])
-                    points[idx] = None
-                points = [p for p in points if p is not None]
+                # Partition in a single pass over the points rather than
+                # sentinel-nulling the outliers and filtering the Nones
+                # back out in a second pass.
+                outlier_set = set(indexes)
+                outliers = [points[idx] for idx in indexes]
+                points = [p for i, p in enumerate(points)
+                          if i not in outlier_set]
 
         usage.log('dist', instance=instance, request=request, data={
             'size': length,
@@ -161,9 +244,17 @@ class FieldDistribution(FieldBase):
             'aware': params['aware'],
         })
 
-        return {
+        data = {
             'data': points,
             'clustered': clustered,
             'outliers': outliers,
             'size': length,
         }
+
+        if etag:
+            cache.set(cache_key, data, timeout)
+            response = self.render(request, data)
+            response['ETag'] = etag
+            return response
+
+        return data
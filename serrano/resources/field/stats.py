@@ -1,9 +1,8 @@
 import logging
-from django.core.urlresolvers import reverse
 from restlib2.params import Parametizer, BoolParam, StrParam
 from avocado.events import usage
 from avocado.query import pipeline
-from .base import FieldBase
+from .base import FieldBase, get_uri_templates
 
 
 log = logging.getLogger(__name__)
@@ -60,13 +59,14 @@ class FieldStats(FieldBase):
             except StopIteration:
                 resp = {}
 
+        uris = get_uri_templates()
+
         resp['_links'] = {
             'self': {
-                'href': uri(
-                    reverse('serrano:field-stats', args=[instance.pk])),
+                'href': uri(uris['stats'].format(instance.pk)),
             },
             'parent': {
-                'href': uri(reverse('serrano:field', args=[instance.pk])),
+                'href': uri(uris['self'].format(instance.pk)),
             },
         }
 
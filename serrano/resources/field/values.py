@@ -1,13 +1,12 @@
 import logging
 from django.db.models import Q
-from django.core.urlresolvers import reverse
 from django.utils.encoding import smart_unicode
 from restlib2.http import codes
 from restlib2.params import StrParam, IntParam, BoolParam
 from avocado.events import usage
 from avocado.query import pipeline
 from ..pagination import PaginatorResource, PaginatorParametizer
-from .base import FieldBase
+from .base import FieldBase, get_uri_templates
 
 
 log = logging.getLogger(__name__)
@@ -133,12 +132,12 @@ class FieldValues(FieldBase, PaginatorResource):
         resp = self.get_page_response(request, paginator, page)
 
         # Add links.
-        path = reverse('serrano:field-values', kwargs={'pk': pk})
+        uris = get_uri_templates()
+        path = uris['values'].format(pk)
 
         links = self.get_page_links(request, path, page, extra=params)
         links['parent'] = {
-            'href': request.build_absolute_uri(reverse('serrano:field',
-                                               kwargs={'pk': pk})),
+            'href': request.build_absolute_uri(uris['self'].format(pk)),
         }
         resp.update({
             '_links': links,
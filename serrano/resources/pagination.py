@@ -17,9 +17,16 @@ class PaginatorResource(Resource):
         paginator = Paginator(queryset, per_page=limit)
         paginator.has_limit = bool(limit)
 
-        # Perform count an update paginator to prevent redundant call
+        # Perform count an update paginator to prevent redundant call.
+        # Use count() when available so the rows are not materialized just
+        # to size the single page. Plain lists also have a count() method,
+        # but it requires an argument, so fall back to len() the same way
+        # Django's paginator does.
         if not limit:
-            count = len(queryset)
+            try:
+                count = queryset.count()
+            except (AttributeError, TypeError):
+                count = len(queryset)
             # Prevent division by zero error in case count is zero
             paginator.per_page = max(count, 1)
             paginator._count = count
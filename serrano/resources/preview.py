@@ -1,9 +1,9 @@
-try:
-    from collections import OrderedDict
-except ImportError:
-    from ordereddict import OrderedDict
+from collections import OrderedDict
+from operator import itemgetter
 from django.conf.urls import patterns, url
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.utils.translation import get_language
 from modeltree.tree import MODELTREE_DEFAULT_ALIAS, trees
 from avocado.query import pipeline
 from avocado.export import HTMLExporter
@@ -17,6 +17,113 @@ class PreviewParametizer(PaginatorParametizer):
     tree = StrParam(MODELTREE_DEFAULT_ALIAS, choices=trees)
 
 
+# Formatted verbose names per model options and active language.
+# Accessing verbose_name forces a lazy translation each time, so the
+# result is computed once per process for each locale.
+_model_names = {}
+
+
+def get_model_names(opts):
+    "Returns the formatted singular and plural verbose names for a model."
+    key = (opts, get_language())
+    names = _model_names.get(key)
+
+    if names is None:
+        names = (opts.verbose_name.format(),
+                 opts.verbose_name_plural.format())
+        _model_names[key] = names
+
+    return names
+
+
+def get_view_header(view):
+    """Returns the list of header keys for the view.
+
+    Parsing the view and resolving the concepts to select hits the
+    database, so the result is cached per view revision. Ad-hoc views
+    built from request data have no pk or modified time to key on and
+    are computed every time.
+
+    TODO: This is flawed since it assumes the output columns
+    of exporter will be one-to-one with the concepts. This should
+    be built during the first iteration of the read, but would also
+    depend on data to exist!
+    """
+    cache_key = None
+
+    if view.pk:
+        cache_key = 'serrano:preview:header:{0}:{1}'.format(
+            view.pk, view.modified.isoformat())
+        header = cache.get(cache_key)
+
+        if header is not None:
+            return header
+
+    header = []
+    view_node = view.parse()
+    ordering = OrderedDict(view_node.ordering)
+
+    for concept in view_node.get_concepts_for_select():
+        obj = {'id': concept.id, 'name': concept.name}
+        if concept.id in ordering:
+            obj['direction'] = ordering[concept.id]
+        header.append(obj)
+
+    if cache_key:
+        cache.set(cache_key, header)
+
+    return header
+
+
+def flatten_rows(exporter, iterable, pk_name, request, offset, limit):
+    """Yields a preview object for each row read from the exporter.
+
+    Kept as a generator so rows flow from the database cursor through the
+    exporter one at a time and only the response payload itself is held,
+    rather than the payload plus per-row intermediates.
+
+    Every row in a page shares the same output shape, so value
+    extraction is specialized from the first row: an itemgetter is built
+    once per output dict and reused, replacing per-cell dict iteration
+    in the hot loop with a C-level call.
+
+    This relies on the exporter emitting the outputs of a row in a fixed
+    order with a fixed key order, which holds because every row is
+    produced by the same ordered concepts and their formatters return
+    ordered dicts keyed by the declared output fields.
+    """
+    getters = None
+
+    for row in exporter.read(iterable, request=request, offset=offset,
+                             limit=limit):
+        # read() yields a generator of output dicts per row, so the row
+        # must be materialized before any positional access.
+        row = list(row)
+
+        if getters is None:
+            # itemgetter with a single key returns a scalar rather than
+            # a tuple, so wrap single-key outputs to keep extraction
+            # uniform.
+            getters = []
+
+            for output in row[1:]:
+                keys = list(output)
+
+                if len(keys) == 1:
+                    getters.append(lambda d, k=keys[0]: (d[k],))
+                else:
+                    getters.append(itemgetter(*keys))
+
+        # The first output dict is always the one containing the pk, so
+        # extract it directly rather than branching on the index for
+        # every cell in the row.
+        values = []
+        for output, getter in zip(row[1:], getters):
+            values.extend(getter(output))
+
+        yield {'pk': row[0][pk_name], 'values': values}
+
+
 class PreviewResource(BaseResource, PaginatorResource):
     """Resource for *previewing* data prior to exporting.
 
@@ -54,47 +161,23 @@ class PreviewResource(BaseResource, PaginatorResource):
         iterable = processor.get_iterable(request=request)
 
         # Build up the header keys.
-        # TODO: This is flawed since it assumes the output columns
-        # of exporter will be one-to-one with the concepts. This should
-        # be built during the first iteration of the read, but would also
-        # depend on data to exist!
-        header = []
-        view_node = view.parse()
-        ordering = OrderedDict(view_node.ordering)
-
-        for concept in view_node.get_concepts_for_select():
-            obj = {'id': concept.id, 'name': concept.name}
-            if concept.id in ordering:
-                obj['direction'] = ordering[concept.id]
-            header.append(obj)
+        header = get_view_header(view)
 
         # Prepare an HTMLExporter
         exporter = processor.get_exporter(HTMLExporter)
         pk_name = queryset.model._meta.pk.name
 
-        objects = []
-
         # 0 limit means all for pagination, however the read method requires
         # an explicit limit or None
         read_limit = limit or None
 
-        for row in exporter.read(iterable, request=request, offset=offset,
-                                 limit=read_limit):
-            pk = None
-            values = []
-
-            for i, output in enumerate(row):
-                if i == 0:
-                    pk = output[pk_name]
-                else:
-                    values.extend(output.values())
-
-            objects.append({'pk': pk, 'values': values})
+        objects = list(flatten_rows(exporter, iterable, pk_name,
+                                    request=request, offset=offset,
+                                    limit=read_limit))
 
         # Various model options
         opts = queryset.model._meta
-        model_name = opts.verbose_name.format()
-        model_name_plural = opts.verbose_name_plural.format()
+        model_name, model_name_plural = get_model_names(opts)
 
         resp = self.get_page_response(request, paginator, page)
 
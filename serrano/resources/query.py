@@ -1,6 +1,5 @@
 import functools
 import logging
-from datetime import datetime
 from django.conf.urls import patterns, url
 from django.core.urlresolvers import reverse
 from django.db.models import Q
@@ -79,17 +78,15 @@ class QueryBase(ThrottledResource):
 
     def get_queryset(self, request, **kwargs):
         "Constructs a QuerySet for this user or session."
+        owner = utils.get_owner_kwargs(request)
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            kwargs['user'] = request.user
-        elif request.session.session_key:
-            kwargs['session_key'] = request.session.session_key
-        else:
-            # The only case where kwargs is empty is for non-authenticated
-            # cookieless agents.. e.g. bots, most non-browser clients since
-            # no session exists yet for the agent.
+        # The only case where the owner kwargs are empty is for
+        # non-authenticated cookieless agents.. e.g. bots, most non-browser
+        # clients since no session exists yet for the agent.
+        if not owner:
             return self.model.objects.none()
 
+        kwargs.update(owner)
         return self.model.objects.filter(**kwargs)
 
     def get_object(self, request, pk=None, session=None, **kwargs):
@@ -286,8 +283,7 @@ class QueryResource(QueryBase):
         instance = self.get_object(request, **kwargs)
         usage.log('read', instance=instance, request=request)
 
-        self.model.objects.filter(pk=instance.pk).update(
-            accessed=datetime.now())
+        self.update_accessed(instance)
 
         return self.prepare(request, instance)
 
@@ -336,7 +332,7 @@ class QueryStatsResource(QueryBase):
         instance = self.get_object(request, **kwargs)
 
         return {
-            'distinct_count': instance.context.apply().distinct().count(),
+            'distinct_count': utils.distinct_count(instance.context.apply()),
             'record_count': instance.apply().count()
         }
 
@@ -1,6 +1,5 @@
 import functools
 import logging
-from datetime import datetime
 from django.conf.urls import patterns, url
 from django.core.urlresolvers import reverse
 from django.views.decorators.cache import never_cache
@@ -8,6 +7,7 @@ from restlib2.http import codes
 from preserialize.serialize import serialize
 from avocado.models import DataView
 from avocado.events import usage
+from serrano import utils
 from serrano.forms import ViewForm
 from .base import ThrottledResource
 from .history import RevisionsResource, ObjectRevisionsResource, \
@@ -42,17 +42,15 @@ class ViewBase(ThrottledResource):
 
     def get_queryset(self, request, **kwargs):
         "Constructs a QuerySet for this user or session."
+        owner = utils.get_owner_kwargs(request)
 
-        if getattr(request, 'user', None) and request.user.is_authenticated():
-            kwargs['user'] = request.user
-        elif request.session.session_key:
-            kwargs['session_key'] = request.session.session_key
-        else:
-            # The only case where kwargs is empty is for non-authenticated
-            # cookieless agents.. e.g. bots, most non-browser clients since
-            # no session exists yet for the agent.
+        # The only case where the owner kwargs are empty is for
+        # non-authenticated cookieless agents.. e.g. bots, most non-browser
+        # clients since no session exists yet for the agent.
+        if not owner:
             return self.model.objects.none()
 
+        kwargs.update(owner)
         return self.model.objects.filter(**kwargs)
 
     def get_default(self, request):
@@ -76,14 +74,12 @@ class ViewsResource(ViewBase):
     def get(self, request):
         queryset = self.get_queryset(request)
 
-        # Only create a default is a session exists
-        if request.session.session_key:
-            queryset = list(queryset)
-
-            if not len(queryset):
-                default = self.get_default(request)
-                if default:
-                    queryset.append(default)
+        # Only create a default is a session exists. The exists() check
+        # compiles to a LIMIT 1 query rather than materializing the full
+        # queryset just to test for emptiness.
+        if request.session.session_key and not queryset.exists():
+            default = self.get_default(request)
+            queryset = [default] if default else []
 
         return self.prepare(request, queryset)
 
@@ -134,8 +130,7 @@ class ViewResource(ViewBase):
         instance = self.get_object(request, **kwargs)
 
         usage.log('read', instance=instance, request=request)
-        self.model.objects.filter(pk=instance.pk).update(
-            accessed=datetime.now())
+        self.update_accessed(instance)
 
         return self.prepare(request, instance)
 
@@ -3,6 +3,56 @@ from django.conf import settings
 from django.core import mail
 
 
+def get_owner_kwargs(request):
+    """Returns keyword arguments identifying the owner of the request.
+
+    An authenticated user owns objects directly, otherwise ownership falls
+    back to the session key. For non-authenticated cookieless agents (e.g.
+    bots and most non-browser clients) no session exists yet, so an empty
+    dict is returned. The result is memoized on the request since the
+    same check is repeated by the forms and resources while processing a
+    single request.
+    """
+    if not hasattr(request, '_serrano_owner'):
+        user = getattr(request, 'user', None)
+
+        if user and user.is_authenticated():
+            owner = {'user': user}
+        elif request.session.session_key:
+            owner = {'session_key': request.session.session_key}
+        else:
+            owner = {}
+
+        request._serrano_owner = owner
+
+    return request._serrano_owner
+
+
+def distinct_count(queryset):
+    """Returns the number of distinct rows for `queryset`.
+
+    A `COUNT(DISTINCT ...)` across every selected column requires the
+    database to compare whole rows which is dramatically slower than
+    comparing a single column. When the query references no joined tables,
+    the primary key already guarantees each row is unique, so a plain
+    `COUNT` suffices. When joins are present, the count is restricted to
+    the distinct set of primary keys.
+    """
+    query = queryset.query
+
+    # Tables are only relevant to the query if they are actually
+    # referenced, i.e. have a non-zero refcount. The base table is always
+    # present, so anything beyond it implies a join that could duplicate
+    # rows in the result set.
+    tables = [alias for alias, count in query.alias_refcount.items()
+              if count]
+
+    if len(tables) > 1:
+        return queryset.order_by().values('pk').distinct().count()
+
+    return queryset.count()
+
+
 def _send_mail(subject, message, sender, recipient_list, fail_silently):
     mail.send_mail(subject, message, sender, recipient_list, fail_silently)
 
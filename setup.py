@@ -1,4 +1,3 @@
-import sys
 from setuptools import setup, find_packages
 
 install_requires = [
@@ -7,9 +6,6 @@ install_requires = [
     'django-preserialize>=1.0.7,<1.1',
 ]
 
-if sys.version_info < (2, 7):
-    install_requires.append('ordereddict>=1.1')
-
 kwargs = {
     # Packages
     'packages': find_packages(exclude=['tests', '*.tests', '*.tests.*',
@@ -45,7 +41,6 @@ kwargs = {
     'classifiers': [
         'Development Status :: 5 - Production/Stable',
         'License :: OSI Approved :: BSD License',
-        'Programming Language :: Python :: 2.6',
         'Programming Language :: Python :: 2.7',
         'Framework :: Django',
         'Topic :: Internet :: WWW/HTTP',
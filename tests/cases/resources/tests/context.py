@@ -39,6 +39,20 @@ class ContextResourceTestCase(AuthenticatedBaseTestCase):
                                    HTTP_ACCEPT='application/json')
         self.assertEqual(response.status_code, codes.not_found)
 
+    def test_get_accessed_throttled(self):
+        ctx = DataContext(user=self.user)
+        ctx.save()
+
+        # With an update interval set, a read within the interval leaves
+        # the just-written accessed time untouched.
+        with self.settings(SERRANO_ACCESSED_UPDATE_INTERVAL=3600):
+            accessed = DataContext.objects.get(pk=ctx.pk).accessed
+            response = self.client.get('/api/contexts/{0}/'.format(ctx.pk),
+                                       HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, codes.ok)
+            self.assertEqual(DataContext.objects.get(pk=ctx.pk).accessed,
+                             accessed)
+
     def test_get_session(self):
         context = DataContext(user=self.user, name='Session Context',
                               session=True)
@@ -1,8 +1,10 @@
 import json
+from django.test import TestCase
 from django.test.utils import override_settings
 from avocado.models import DataField
 from avocado.events.models import Log
 from restlib2.http import codes
+from serrano.resources.field import dist
 from .base import BaseTestCase
 from tests.models import Title
 
@@ -444,3 +446,44 @@ class FieldResourceTestCase(BaseTestCase):
                 u'values': [{'label': '15000', 'value': 15000}]
             }]
         })
+
+    def test_dist_cached(self):
+        # title.salary
+        with self.settings(SERRANO_DISTRIBUTION_CACHE_TIMEOUT=60):
+            response = self.client.get('/api/fields/3/dist/',
+                                       HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, codes.ok)
+            etag = response['ETag']
+            self.assertTrue(etag)
+
+            # A conditional request with a matching tag is answered
+            # without recomputing the distribution.
+            response = self.client.get('/api/fields/3/dist/',
+                                       HTTP_ACCEPT='application/json',
+                                       HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, codes.not_modified)
+
+            # Different parameters produce a different tag.
+            response = self.client.get('/api/fields/3/dist/?sort=count',
+                                       HTTP_ACCEPT='application/json',
+                                       HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, codes.ok)
+            self.assertNotEqual(response['ETag'], etag)
+
+        # Caching is opt-in; without the setting no validator is attached.
+        response = self.client.get('/api/fields/3/dist/',
+                                   HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, codes.ok)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class RunStatsTestCase(TestCase):
+    def test_inline(self):
+        # Without workers configured the routine runs inline.
+        self.assertEqual(dist.run_stats(sum, [1, 2, 3]), 6)
+
+    def test_pooled(self):
+        # With workers configured the call dispatches to the shared pool
+        # and still blocks for the result.
+        with self.settings(SERRANO_STATS_WORKERS=2):
+            self.assertEqual(dist.run_stats(sum, [1, 2, 3]), 6)